@@ -6,152 +6,364 @@ Transcribe videos and audio from multiple sources using OpenAI's Whisper
 
 import streamlit as st
 import os
+import re
+import json
+import hashlib
 import tempfile
+import threading
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from numba import njit
 import yt_dlp
-import whisper
+import ctranslate2
+from faster_whisper import BatchedInferencePipeline, WhisperModel, decode_audio, download_model
+from huggingface_hub.utils import LocalEntryNotFoundError
 from datetime import datetime
 import time
 
 
+# Anything other than letters, digits, spaces, hyphens and underscores
+_UNSAFE_TITLE_CHARS = re.compile(r"[^\w \-]")
+
+# Extensions accepted when looking for a downloaded audio file
+_AUDIO_EXTS = frozenset({'.mp3', '.m4a', '.opus', '.webm', '.ogg', '.wav', '.flac', '.aac', '.mp4', '.mkv'})
+
+
+def _resolve_device(device):
+    """Auto-detect the device if set to 'auto'"""
+    if device == "auto":
+        return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+    return device
+
+
+def _pick_compute_type(device):
+    """Pick the CTranslate2 compute type for a device"""
+    if device != "cuda":
+        return "int8"
+    
+    # CTranslate2 only reports float16 on GPUs with Tensor Cores (Volta or
+    # newer); older cards run FP16 on slow emulated paths, so stay in FP32
+    if "float16" in ctranslate2.get_supported_compute_types("cuda"):
+        return "float16"
+    return "float32"
+
+
+def _format_timestamps(seconds):
+    """Format an array of seconds to HH:MM:SS strings"""
+    hours, rem = np.divmod(seconds.astype(np.int64), 3600)
+    minutes, secs = np.divmod(rem, 60)
+    return [
+        f"{h:02d}:{m:02d}:{s:02d}"
+        for h, m, s in zip(hours.tolist(), minutes.tolist(), secs.tolist())
+    ]
+
+
+def _audio_fingerprint(audio_file, chunk_size=1024 * 1024):
+    """Hash the size plus the first and last MB of a path or file-like object"""
+    if isinstance(audio_file, Path):
+        with open(audio_file, 'rb') as f:
+            return _audio_fingerprint(f, chunk_size)
+    
+    size = audio_file.seek(0, os.SEEK_END)
+    digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+    audio_file.seek(0)
+    digest.update(audio_file.read(chunk_size))
+    audio_file.seek(max(size - chunk_size, 0))
+    digest.update(audio_file.read(chunk_size))
+    audio_file.seek(0)
+    return digest.hexdigest()
+
+
+@njit(cache=True)
+def _paragraph_boundaries(starts, ends, max_len=6, pause_thresh=1.5):
+    """Mark the segments that end a lyrics paragraph"""
+    n = len(starts)
+    boundaries = np.zeros(n, dtype=np.bool_)
+    count = 0
+    for i in range(n):
+        count += 1
+        if i == n - 1 or starts[i + 1] - ends[i] > pause_thresh or count >= max_len:
+            boundaries[i] = True
+            count = 0
+    return boundaries
+
+
 class TranscriberApp:
+    downloads_dir = Path("downloads")
+    transcripts_dir = Path("transcripts")
+    # Transcriptions kept in transcripts/.cache before the oldest are pruned
+    cache_max_entries = 200
+    
     def __init__(self, model_size="large", device="auto"):
         """Initialize the transcriber"""
-        # Auto-detect device if set to 'auto'
-        if device == "auto":
-            try:
-                import torch
-                device = "cuda" if torch.cuda.is_available() else "cpu"
-            except:
-                device = "cpu"
+        device = _resolve_device(device)
         
+        self.model_size = model_size
         self.device = device
-        self.model = whisper.load_model(model_size, device=device)
-        self.downloads_dir = Path("downloads")
-        self.transcripts_dir = Path("transcripts")
+        self.compute_type = _pick_compute_type(device)
+        
+        # Resolve the model from the local cache so cold starts skip the
+        # Hugging Face Hub round-trip; only go online if it isn't cached yet.
+        # On a miss faster-whisper logs an "error occured while synchronizing"
+        # warning before raising; that is expected on the very first run.
+        try:
+            model_path = download_model(model_size, local_files_only=True)
+        except LocalEntryNotFoundError:
+            model_path = None
+        
+        # An interrupted download leaves a snapshot without model.bin; going
+        # online resumes it instead of failing on every start
+        if model_path is None or not (Path(model_path) / "model.bin").exists():
+            model_path = download_model(model_size)
+        self.model = WhisperModel(model_path, device=device, compute_type=self.compute_type)
+        self.batched_model = BatchedInferencePipeline(model=self.model)
         
         # Create directories if they don't exist
         self.downloads_dir.mkdir(exist_ok=True)
         self.transcripts_dir.mkdir(exist_ok=True)
+        self.cache_dir = self.transcripts_dir / ".cache"
+        self.cache_dir.mkdir(exist_ok=True)
     
-    def download_audio(self, url, audio_quality="original", progress_callback=None):
-        """Download audio from URL"""
-        ydl_opts = {
-            'format': 'bestaudio/best',
-            'outtmpl': str(self.downloads_dir / '%(title)s.%(ext)s'),
-            'quiet': True,
-            'no_warnings': True,
-        }
+    @classmethod
+    def download_audio(cls, url, audio_quality="original", progress_callback=None, downloader=None):
+        """Download audio from URL (does not need a loaded model)"""
+        cls.downloads_dir.mkdir(exist_ok=True)
         
-        # Only convert to AAC if explicitly requested
-        if audio_quality == 'aac':
-            ydl_opts['postprocessors'] = [{
-                'key': 'FFmpegExtractAudio',
-                'preferredcodec': 'aac',
-                'preferredquality': '192',
-            }]
-        
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        # Reuse the (YoutubeDL, Lock) pair from get_session_ydl when given
+        ydl, ydl_lock = downloader or (_build_ydl(audio_quality), threading.Lock())
+        # YoutubeDL is not thread-safe; the lock only covers this session's instance
+        with ydl_lock:
             info = ydl.extract_info(url, download=True)
-            video_title = info['title']
-            
             # Get the actual downloaded filename
             downloaded_file = Path(ydl.prepare_filename(info))
-            
-            if audio_quality == 'aac':
-                audio_file = downloaded_file.with_suffix('.m4a')
-            else:
-                audio_file = downloaded_file
-            
-            if not audio_file.exists():
-                # Fallback: find the most recent audio file
-                import glob
-                base_name = downloaded_file.stem
-                pattern = str(self.downloads_dir / f"{base_name}.*")
-                files = glob.glob(pattern)
-                audio_exts = {'.mp3', '.m4a', '.opus', '.webm', '.ogg', '.wav', '.flac', '.aac', '.mp4', '.mkv'}
-                audio_files = [f for f in files if Path(f).suffix.lower() in audio_exts]
-                if audio_files:
-                    audio_file = Path(max(audio_files, key=os.path.getctime))
-            
-            return audio_file, video_title
+        
+        video_title = info['title']
+        
+        if audio_quality == 'aac':
+            audio_file = downloaded_file.with_suffix('.m4a')
+        else:
+            audio_file = downloaded_file
+        
+        if not audio_file.exists():
+            # Fallback: find the most recent audio file
+            prefix = f"{downloaded_file.stem}."
+            with os.scandir(cls.downloads_dir) as entries:
+                audio_files = [
+                    entry for entry in entries
+                    if entry.name.startswith(prefix) and Path(entry.name).suffix.lower() in _AUDIO_EXTS
+                ]
+            if audio_files:
+                audio_file = Path(max(audio_files, key=lambda entry: entry.stat().st_ctime).path)
+        
+        return audio_file, video_title
+    
+    def _load_audio(self, audio_file):
+        """Decode a path or file-like object to 16 kHz mono float32 samples in-process"""
+        if isinstance(audio_file, Path):
+            audio_file = str(audio_file)
+        return decode_audio(audio_file, sampling_rate=self.model.feature_extractor.sampling_rate)
+    
+    def _cache_file(self, audio_file, language, pipeline):
+        """Cache path for an audio file's transcription with the current settings"""
+        fingerprint = _audio_fingerprint(audio_file)
+        settings = f"{self.model_size}_{self.device}_{self.compute_type}_{pipeline}_{language or 'auto'}"
+        return self.cache_dir / f"{fingerprint}_{settings}.json"
+    
+    def _load_cached(self, cache_file):
+        """Return a cached transcription, or None if there isn't one"""
+        try:
+            result = json.loads(cache_file.read_text(encoding='utf-8'))
+            # Refresh the mtime so pruning keeps recently used entries
+            os.utime(cache_file)
+        except FileNotFoundError:
+            return None
+        return result
+    
+    def _save_cached(self, cache_file, result):
+        """Write a transcription to the cache atomically"""
+        tmp_file = tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=self.cache_dir,
+                                               suffix='.tmp', delete=False)
+        try:
+            with tmp_file:
+                json.dump(result, tmp_file)
+            os.replace(tmp_file.name, cache_file)
+        except BaseException:
+            os.unlink(tmp_file.name)
+            raise
+        
+        self._prune_cache()
+    
+    def _prune_cache(self):
+        """Delete the least recently used cache entries beyond cache_max_entries"""
+        with os.scandir(self.cache_dir) as entries:
+            cached = [entry for entry in entries if entry.name.endswith('.json')]
+        if len(cached) <= self.cache_max_entries:
+            return
+        
+        cached.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        for entry in cached[self.cache_max_entries:]:
+            try:
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
     
     def transcribe_audio(self, audio_file, language=None):
         """Transcribe an audio file using Whisper"""
-        use_fp16 = self.device == "cuda"
-        transcribe_options = {"fp16": use_fp16}
+        cache_file = self._cache_file(audio_file, language, "sequential")
+        cached = self._load_cached(cache_file)
+        if cached is not None:
+            return cached
         
-        if language:
-            transcribe_options["language"] = language
-        
-        result = self.model.transcribe(str(audio_file), **transcribe_options)
+        audio = self._load_audio(audio_file)
+        segments, info = self.model.transcribe(audio, language=language, beam_size=5)
+        result = self._build_result(segments, info)
+        self._save_cached(cache_file, result)
         return result
     
+    def transcribe_batch(self, audio_files, language=None, batch_size=16):
+        """Transcribe several audio files, batching their 30s windows through the encoder"""
+        results = []
+        for audio_file in audio_files:
+            cache_file = self._cache_file(audio_file, language, "batched")
+            cached = self._load_cached(cache_file)
+            if cached is not None:
+                results.append(cached)
+                continue
+            
+            audio = self._load_audio(audio_file)
+            # Keep timestamp tokens so segments stay sentence-level, matching
+            # transcribe_audio, instead of one segment per 30s VAD chunk.
+            # The batched pipeline needs VAD to split audio into windows, so
+            # unlike transcribe_audio it can skip non-speech such as singing
+            segments, info = self.batched_model.transcribe(
+                audio, language=language, beam_size=5, batch_size=batch_size,
+                without_timestamps=False, vad_filter=True
+            )
+            result = self._build_result(segments, info)
+            self._save_cached(cache_file, result)
+            results.append(result)
+        return results
+    
+    def _build_result(self, segments, info):
+        """Collect faster-whisper output into a result dict"""
+        # faster-whisper yields segments lazily; decoding happens while iterating
+        segments = [
+            {"start": segment.start, "end": segment.end, "text": segment.text}
+            for segment in segments
+        ]
+        return {
+            "language": info.language,
+            "segments": segments,
+            "text": "".join(segment["text"] for segment in segments),
+        }
+    
     def save_transcript(self, video_title, result, source_url):
         """Save the transcription to text files"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_title = "".join(c for c in video_title if c.isalnum() or c in (' ', '-', '_')).rstrip()
+        safe_title = _UNSAFE_TITLE_CHARS.sub("", video_title).rstrip()
         safe_title = safe_title[:50]
         
-        # Files
-        txt_file = self.transcripts_dir / f"{safe_title}_{timestamp}.txt"
-        srt_file = self.transcripts_dir / f"{safe_title}_{timestamp}_timestamps.txt"
-        lyrics_file = self.transcripts_dir / f"{safe_title}_{timestamp}_lyrics.txt"
+        # Files; add a counter if another transcript in the same second
+        # (e.g. talk.mp3 and talk.wav in one batch) already took the name
+        base_name = f"{safe_title}_{timestamp}"
+        counter = 1
+        while (self.transcripts_dir / f"{base_name}.txt").exists():
+            counter += 1
+            base_name = f"{safe_title}_{timestamp}_{counter}"
+        
+        txt_file = self.transcripts_dir / f"{base_name}.txt"
+        srt_file = self.transcripts_dir / f"{base_name}_timestamps.txt"
+        lyrics_file = self.transcripts_dir / f"{base_name}_lyrics.txt"
+        
+        segments = result['segments']
+        starts = np.fromiter((segment['start'] for segment in segments), float, len(segments))
+        ends = np.fromiter((segment['end'] for segment in segments), float, len(segments))
         
         # Save complete transcription
-        with open(txt_file, 'w', encoding='utf-8') as f:
-            f.write(f"Transcription of: {video_title}\n")
-            f.write(f"Source: {source_url}\n")
-            f.write(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Language: {result['language']}\n")
-            f.write("=" * 80 + "\n\n")
-            f.write(result['text'].strip())
+        parts = [
+            f"Transcription of: {video_title}\n",
+            f"Source: {source_url}\n",
+            f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n",
+            f"Language: {result['language']}\n",
+            "=" * 80 + "\n\n",
+            result['text'].strip(),
+        ]
+        txt_file.write_text(''.join(parts), encoding='utf-8')
         
         # Save with timestamps
-        with open(srt_file, 'w', encoding='utf-8') as f:
-            f.write(f"Transcription with timestamps of: {video_title}\n")
-            f.write(f"Source: {source_url}\n")
-            f.write("=" * 80 + "\n\n")
-            
-            for segment in result['segments']:
-                start_time = self._format_timestamp(segment['start'])
-                end_time = self._format_timestamp(segment['end'])
-                text = segment['text'].strip()
-                f.write(f"[{start_time} --> {end_time}]\n{text}\n\n")
+        parts = [
+            f"Transcription with timestamps of: {video_title}\n",
+            f"Source: {source_url}\n",
+            "=" * 80 + "\n\n",
+        ]
+        start_times = _format_timestamps(starts)
+        end_times = _format_timestamps(ends)
+        for start_time, end_time, segment in zip(start_times, end_times, segments):
+            text = segment['text'].strip()
+            parts.append(f"[{start_time} --> {end_time}]\n{text}\n\n")
+        srt_file.write_text(''.join(parts), encoding='utf-8')
         
         # Save lyrics format
-        with open(lyrics_file, 'w', encoding='utf-8') as f:
-            f.write(f"Transcription of: {video_title}\n")
-            f.write(f"Source: {source_url}\n")
-            f.write("=" * 80 + "\n\n")
-            
-            current_paragraph = []
-            for i, segment in enumerate(result['segments']):
-                text = segment['text'].strip()
-                current_paragraph.append(text)
-                
-                is_long_pause = False
-                if i + 1 < len(result['segments']):
-                    next_segment = result['segments'][i + 1]
-                    pause_duration = next_segment['start'] - segment['end']
-                    is_long_pause = pause_duration > 1.5
-                
-                is_paragraph_full = len(current_paragraph) >= 6
-                is_last_segment = i == len(result['segments']) - 1
-                
-                if is_long_pause or is_paragraph_full or is_last_segment:
-                    paragraph_text = '\n'.join(current_paragraph)
-                    f.write(f"{paragraph_text}\n\n")
-                    current_paragraph = []
+        parts = [
+            f"Transcription of: {video_title}\n",
+            f"Source: {source_url}\n",
+            "=" * 80 + "\n\n",
+        ]
+        
+        # A paragraph ends after a long pause, after 6 lines, or at the end
+        texts = [segment['text'].strip() for segment in segments]
+        start = 0
+        for end in (np.flatnonzero(_paragraph_boundaries(starts, ends)) + 1).tolist():
+            paragraph_text = '\n'.join(texts[start:end])
+            parts.append(f"{paragraph_text}\n\n")
+            start = end
+        lyrics_file.write_text(''.join(parts), encoding='utf-8')
         
         return txt_file, srt_file, lyrics_file
+
+
+def get_transcriber(model_size, device):
+    """Return a transcriber whose model stays loaded across reruns"""
+    # Resolve 'auto' first so it shares a cache entry with the concrete device
+    return _load_transcriber(model_size, _resolve_device(device))
+
+
+# Only one model stays resident; switching model or device evicts the old one
+@st.cache_resource(max_entries=1)
+def _load_transcriber(model_size, device):
+    """Build a transcriber, cached per (model_size, device)"""
+    return TranscriberApp(model_size=model_size, device=device)
+
+
+def _build_ydl(audio_quality):
+    """Build a YoutubeDL configured for an audio quality"""
+    ydl_opts = {
+        'format': 'bestaudio/best',
+        'outtmpl': str(TranscriberApp.downloads_dir / '%(title)s.%(ext)s'),
+        'quiet': True,
+        'no_warnings': True,
+    }
+    
+    # Only convert to AAC if explicitly requested
+    if audio_quality == 'aac':
+        ydl_opts['postprocessors'] = [{
+            'key': 'FFmpegExtractAudio',
+            'preferredcodec': 'aac',
+            'preferredquality': '192',
+        }]
     
-    def _format_timestamp(self, seconds):
-        """Format seconds to HH:MM:SS"""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+    return yt_dlp.YoutubeDL(ydl_opts)
+
+
+def get_session_ydl(audio_quality):
+    """Return this session's YoutubeDL (and the lock guarding it) for an audio quality"""
+    # Kept per session rather than in st.cache_resource so one user's
+    # download never waits on another's
+    downloaders = st.session_state.setdefault('downloaders', {})
+    if audio_quality not in downloaders:
+        downloaders[audio_quality] = (_build_ydl(audio_quality), threading.Lock())
+    return downloaders[audio_quality]
 
 
 def main():
@@ -166,12 +378,8 @@ def main():
     st.markdown("*Powered by OpenAI Whisper AI*")
     
     # Initialize session state for transcription results
-    if 'transcription_result' not in st.session_state:
-        st.session_state.transcription_result = None
-    if 'transcript_files' not in st.session_state:
-        st.session_state.transcript_files = None
-    if 'video_title' not in st.session_state:
-        st.session_state.video_title = None
+    if 'transcriptions' not in st.session_state:
+        st.session_state.transcriptions = None
     
     # Sidebar configuration
     with st.sidebar:
@@ -241,12 +449,10 @@ def main():
         keep_audio = st.checkbox("Keep downloaded audio file", value=False)
         
         # New transcription button
-        if st.session_state.transcription_result is not None:
+        if st.session_state.transcriptions is not None:
             st.markdown("---")
             if st.button("🔄 New Transcription", use_container_width=True):
-                st.session_state.transcription_result = None
-                st.session_state.transcript_files = None
-                st.session_state.video_title = None
+                st.session_state.transcriptions = None
                 st.rerun()
     
     # Main content area
@@ -262,9 +468,8 @@ def main():
             horizontal=True
         )
         
-        audio_file = None
-        video_title = None
-        source_url = None
+        # (audio_file, video_title, source_url) for each input to transcribe
+        audio_files = []
         
         if input_method == "URL (YouTube, Vimeo, etc.)":
             url = st.text_input(
@@ -274,49 +479,67 @@ def main():
             )
             
             if url and st.button("🚀 Start Transcription", type="primary", use_container_width=True):
-                try:
-                    with st.spinner("Initializing..."):
-                        transcriber = TranscriberApp(model_size=model_size, device=device)
+                # Download in the background while the model loads (only
+                # overlaps on the first run; the model is cached afterwards)
+                downloader = get_session_ydl(audio_quality)
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    download = executor.submit(TranscriberApp.download_audio, url, audio_quality,
+                                               downloader=downloader)
                     
-                    # Download
-                    with st.spinner("📥 Downloading audio..."):
-                        audio_file, video_title = transcriber.download_audio(url, audio_quality)
-                        st.success(f"✅ Downloaded: {video_title}")
-                    
-                    source_url = url
+                    try:
+                        with st.spinner("Initializing..."):
+                            transcriber = get_transcriber(model_size, device)
+                    except Exception as e:
+                        st.error(f"❌ Initialization error: {str(e)}")
+                        # A started download can't be cancelled; let it finish
+                        # so its file doesn't linger in downloads/
+                        try:
+                            audio_file, _ = download.result()
+                            if not keep_audio and audio_file.exists():
+                                audio_file.unlink()
+                        except Exception:
+                            pass
+                        st.stop()
                     
-                except Exception as e:
-                    st.error(f"❌ Download error: {str(e)}")
-                    st.stop()
+                    try:
+                        with st.spinner("📥 Downloading audio..."):
+                            audio_file, video_title = download.result()
+                            st.success(f"✅ Downloaded: {video_title}")
+                        
+                        audio_files.append((audio_file, video_title, url))
+                        
+                    except Exception as e:
+                        st.error(f"❌ Download error: {str(e)}")
+                        st.stop()
         
         else:  # Upload File
-            uploaded_file = st.file_uploader(
-                "Upload video or audio file",
+            uploaded_files = st.file_uploader(
+                "Upload video or audio files",
                 type=['mp4', 'mkv', 'avi', 'mov', 'flv', 'wmv', 'webm', 
                       'mp3', 'wav', 'm4a', 'flac', 'ogg', 'aac'],
-                help="Supports most video and audio formats"
+                accept_multiple_files=True,
+                help="Supports most video and audio formats\n\n*Several files are transcribed in batches, which skips "
+                     "detected non-speech (this can drop sung vocals); a single file is transcribed like a URL*"
             )
             
-            if uploaded_file and st.button("🚀 Start Transcription", type="primary", use_container_width=True):
+            if uploaded_files and st.button("🚀 Start Transcription", type="primary", use_container_width=True):
                 try:
                     with st.spinner("Initializing..."):
-                        transcriber = TranscriberApp(model_size=model_size, device=device)
+                        transcriber = get_transcriber(model_size, device)
                     
-                    # Save uploaded file temporarily
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=Path(uploaded_file.name).suffix) as tmp_file:
-                        tmp_file.write(uploaded_file.getbuffer())
-                        audio_file = Path(tmp_file.name)
-                    
-                    video_title = Path(uploaded_file.name).stem
-                    source_url = f"Local file: {uploaded_file.name}"
-                    st.success(f"✅ File loaded: {uploaded_file.name}")
+                    for uploaded_file in uploaded_files:
+                        # Uploads are decoded straight from memory, no temp file needed
+                        video_title = Path(uploaded_file.name).stem
+                        source_url = f"Local file: {uploaded_file.name}"
+                        audio_files.append((uploaded_file, video_title, source_url))
+                        st.success(f"✅ File loaded: {uploaded_file.name}")
                     
                 except Exception as e:
                     st.error(f"❌ File error: {str(e)}")
                     st.stop()
         
         # Transcription
-        if audio_file:
+        if audio_files:
             try:
                 # Transcribe
                 with st.spinner("🎤 Transcribing audio... This may take several minutes."):
@@ -333,80 +556,85 @@ def main():
                     }
                     status_text.text(f"Estimated time: {time_estimates.get(model_size, 'several minutes')}")
                     
-                    result = transcriber.transcribe_audio(audio_file, language)
+                    if len(audio_files) > 1:
+                        results = transcriber.transcribe_batch(
+                            [audio_file for audio_file, _, _ in audio_files], language
+                        )
+                    else:
+                        audio_file = audio_files[0][0]
+                        results = [transcriber.transcribe_audio(audio_file, language)]
                     progress_bar.progress(100)
                 
                 # Save files
+                transcriptions = []
                 with st.spinner("💾 Saving transcription files..."):
-                    txt_file, srt_file, lyrics_file = transcriber.save_transcript(
-                        video_title, result, source_url
-                    )
+                    for (audio_file, video_title, source_url), result in zip(audio_files, results):
+                        files = transcriber.save_transcript(video_title, result, source_url)
+                        # Segments are already on disk; only keep what the UI shows
+                        transcriptions.append({
+                            "title": video_title,
+                            "result": {"language": result["language"], "text": result["text"]},
+                            "files": files,
+                        })
                 
                 # Store in session state
-                st.session_state.transcription_result = result
-                st.session_state.transcript_files = (txt_file, srt_file, lyrics_file)
-                st.session_state.video_title = video_title
+                st.session_state.transcriptions = transcriptions
                 
                 # Cleanup
-                if not keep_audio and source_url and source_url.startswith("http"):
-                    if audio_file.exists():
-                        audio_file.unlink()
-                
-                # Cleanup temp files for uploads
-                if input_method == "Upload File" and audio_file.exists():
-                    try:
-                        audio_file.unlink()
-                    except:
-                        pass
+                for audio_file, _, source_url in audio_files:
+                    if not keep_audio and source_url.startswith("http"):
+                        if audio_file.exists():
+                            audio_file.unlink()
                 
             except Exception as e:
                 st.error(f"❌ Transcription error: {str(e)}")
         
         # Display results if they exist in session state
-        if st.session_state.transcription_result is not None:
-            result = st.session_state.transcription_result
-            txt_file, srt_file, lyrics_file = st.session_state.transcript_files
-            
-            st.success(f"✅ Transcription completed! Detected language: **{result['language']}**")
-            
-            # Display transcription
-            st.subheader("📝 Transcription")
-            with st.expander("View full transcription", expanded=True):
-                st.text_area("Text", result['text'], height=300, key="transcription_display")
-            
-            st.success("✅ Files saved!")
-            
-            # Download buttons
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                with open(txt_file, 'r', encoding='utf-8') as f:
+        if st.session_state.transcriptions is not None:
+            for index, transcription in enumerate(st.session_state.transcriptions):
+                result = transcription["result"]
+                txt_file, srt_file, lyrics_file = transcription["files"]
+                
+                if index > 0:
+                    st.markdown("---")
+                
+                st.success(f"✅ Transcription completed! Detected language: **{result['language']}**")
+                
+                # Display transcription
+                st.subheader(f"📝 {transcription['title']}")
+                with st.expander("View full transcription", expanded=True):
+                    st.text_area("Text", result['text'], height=300, key=f"transcription_display_{index}")
+                
+                st.success("✅ Files saved!")
+                
+                # Download buttons
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
                     st.download_button(
                         label="📄 Download Full Text",
-                        data=f.read(),
+                        data=txt_file.read_bytes(),
                         file_name=txt_file.name,
                         mime="text/plain",
-                        key="download_txt"
+                        key=f"download_txt_{index}"
                     )
-            
-            with col2:
-                with open(srt_file, 'r', encoding='utf-8') as f:
+                
+                with col2:
                     st.download_button(
                         label="⏱️ Download with Timestamps",
-                        data=f.read(),
+                        data=srt_file.read_bytes(),
                         file_name=srt_file.name,
                         mime="text/plain",
-                        key="download_srt"
+                        key=f"download_srt_{index}"
                     )
-            
-            with col3:
-                with open(lyrics_file, 'r', encoding='utf-8') as f:
+                
+                with col3:
                     st.download_button(
                         label="📖 Download Lyrics Format",
-                        data=f.read(),
+                        data=lyrics_file.read_bytes(),
                         file_name=lyrics_file.name,
                         mime="text/plain",
-                        key="download_lyrics"
+                        key=f"download_lyrics_{index}"
                     )
     
     with tab2: